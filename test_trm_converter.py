@@ -1,18 +1,25 @@
 import base64
 import json
+import os
 import struct
 from pathlib import Path
 
 import pytest
 
+import trm_converter
 from trm_converter import (
     ENTRY_SIZE,
+    HEADER_OFFSET,
     NAME_SIZE,
     json_file_to_trm,
     main,
     parse_trm_binary_bytes,
     parse_trm_text,
+    patch_trm,
+    trm_binary_from_json,
+    trm_from_mapping,
     trm_file_to_json,
+    write_json,
 )
 
 
@@ -89,6 +96,46 @@ def test_parse_binary_trm_to_json(tmp_path: Path):
     assert footer == [i * 1.5 for i in range(FOOTER_FLOAT_COUNT)]
 
 
+def test_large_files_are_parsed_via_mmap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    trm_path = _build_trm_file(tmp_path, entry_count=3)
+    text_path = tmp_path / "text.trm"
+    text_path.write_text("name = Example\n", encoding="utf-8")
+    expected = trm_file_to_json(trm_path)
+
+    monkeypatch.setattr(trm_converter, "MMAP_THRESHOLD", 0)
+
+    assert trm_file_to_json(trm_path) == expected
+    assert trm_file_to_json(text_path) == {"name": "Example"}
+
+
+def test_cached_reparsing_returns_independent_results(tmp_path: Path):
+    trm_path = _build_trm_file(tmp_path)
+
+    first = trm_file_to_json(trm_path, cached=True)
+    first["entries"][0]["count"] = 999
+    first["entries"][0]["position"]["x"] = -1.0
+    first["footer"]["floats"][0] = 42.0
+
+    second = trm_file_to_json(trm_path, cached=True)
+    assert second["entries"][0]["count"] == 5
+    assert second["entries"][0]["position"]["x"] == 1.0
+    assert second["footer"]["floats"][0] == 0.0
+
+    _build_trm_file(tmp_path, entry_count=2)
+    assert trm_file_to_json(trm_path, cached=True)["entry_count"] == 2
+
+
+def test_uncached_parse_sees_same_size_rewrite(tmp_path: Path):
+    trm_path = _build_trm_file(tmp_path)
+    stat = trm_path.stat()
+    assert trm_file_to_json(trm_path)["entries"][0]["count"] == 5
+
+    trm_path.write_bytes(patch_trm(trm_path.read_bytes(), {"entries": {"0": {"count": 0}}}))
+    os.utime(trm_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert trm_file_to_json(trm_path)["entries"][0]["count"] == 0
+
+
 def test_binary_roundtrip_and_edit(tmp_path: Path):
     original_path = _build_trm_file(tmp_path)
     parsed = trm_file_to_json(original_path)
@@ -96,13 +143,14 @@ def test_binary_roundtrip_and_edit(tmp_path: Path):
     entry = parsed["entries"][0]
     entry["count"] = 999
     entry["rate"] = 0.1
+    entry["rate_u32"] = None  # ignored while "rate" is set
     entry["position"]["z"] = 9.5
 
     json_path = tmp_path / "payload.json"
     json_path.write_text(json.dumps(parsed), encoding="utf-8")
 
     rebuilt_bytes = json_file_to_trm(json_path)
-    assert isinstance(rebuilt_bytes, bytes)
+    assert isinstance(rebuilt_bytes, (bytes, bytearray))
 
     reparsed = parse_trm_binary_bytes(rebuilt_bytes)
     rebuilt_entry = reparsed["entries"][0]
@@ -117,6 +165,118 @@ def test_binary_roundtrip_and_edit(tmp_path: Path):
     assert original_tail == rebuilt_tail
 
 
+def test_in_memory_raw_entries_are_encoded_on_write(tmp_path: Path):
+    original_bytes = _build_trm_file(tmp_path, entry_count=2).read_bytes()
+    parsed = parse_trm_binary_bytes(original_bytes, encode_raw=False)
+
+    entry = parsed["entries"][0]
+    assert isinstance(entry["raw_entry"], memoryview)
+    assert "raw_entry_base64" not in entry
+
+    json_path = tmp_path / "payload.json"
+    write_json(parsed, json_path)
+
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    assert "raw_entry" not in data["entries"][0]
+    assert base64.b64decode(data["entries"][0]["raw_entry_base64"]) == bytes(entry["raw_entry"])
+    assert json_file_to_trm(json_path) == original_bytes
+
+
+def test_in_memory_raw_entries_roundtrip_without_base64(tmp_path: Path):
+    original_bytes = _build_trm_file(tmp_path, entry_count=2).read_bytes()
+    parsed = parse_trm_binary_bytes(original_bytes, encode_raw=False)
+
+    assert trm_binary_from_json(parsed) == original_bytes
+
+    parsed["entries"][1]["count"] = 77
+    assert parse_trm_binary_bytes(trm_binary_from_json(parsed))["entries"][1]["count"] == 77
+
+
+def test_raw_binary_base64_is_returned_as_bytearray(tmp_path: Path):
+    json_path = tmp_path / "payload.json"
+    json_path.write_text(json.dumps({"__raw_binary_base64": "AAEC"}), encoding="utf-8")
+
+    result = json_file_to_trm(json_path)
+    assert isinstance(result, bytearray)
+    assert result == b"\x00\x01\x02"
+
+
+def test_raw_entry_from_json_is_rejected(tmp_path: Path):
+    json_path = tmp_path / "payload.json"
+    json_path.write_text(json.dumps({"entries": [{"raw_entry": "A" * ENTRY_SIZE}]}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="raw_entry must be a bytes-like object"):
+        json_file_to_trm(json_path)
+
+
+def test_non_finite_floats_survive_json_roundtrip(tmp_path: Path):
+    trm_path = _build_trm_file(tmp_path)
+    original_bytes = bytearray(trm_path.read_bytes())
+    struct.pack_into("<2f", original_bytes, len(original_bytes) - 8, float("nan"), float("inf"))
+    trm_path.write_bytes(original_bytes)
+
+    out_json = tmp_path / "out.json"
+    out_trm = tmp_path / "restored.trm"
+    main(["to-json", str(trm_path), str(out_json)])
+    main(["to-trm", str(out_json), str(out_trm)])
+
+    assert out_trm.read_bytes() == original_bytes
+
+
+def test_patch_trm_rewrites_only_the_edited_fields(tmp_path: Path):
+    original_bytes = _build_trm_file(tmp_path, entry_count=2).read_bytes()
+
+    patched = patch_trm(
+        original_bytes,
+        {"entries": {"1": {"count": 77, "rate": 0.1, "position": {"z": 9.5}, "name": "New"}}},
+    )
+
+    assert len(patched) == len(original_bytes)
+    original = parse_trm_binary_bytes(original_bytes)
+    reparsed = parse_trm_binary_bytes(bytes(patched))
+    assert reparsed["entries"][0] == original["entries"][0]
+
+    entry = reparsed["entries"][1]
+    assert entry["name"] == "New"
+    assert entry["count"] == 77
+    assert pytest.approx(entry["rate"], rel=1e-6) == 0.1
+    assert entry["position"] == {"x": 1.0, "y": 2.0, "z": 9.5}
+    assert patched[HEADER_OFFSET + ENTRY_SIZE + 0x60 :] == original_bytes[HEADER_OFFSET + ENTRY_SIZE + 0x60 :]
+
+    with pytest.raises(ValueError):
+        patch_trm(original_bytes, {"entries": {"2": {"count": 1}}})
+    with pytest.raises(ValueError):
+        patch_trm(original_bytes, {"entries": {"0": {"unknown": 1}}})
+
+
+@pytest.mark.parametrize(
+    "entry_patches",
+    [
+        {"0": {"count": -1}},
+        {"0": {"count": 2**32}},
+        {"0": {"count": "many"}},
+        {"0": {"count": "12"}},
+        {"0": {"count": " 7 "}},
+        {"0": {"count": 1.9}},
+        {"0": {"count": True}},
+        {"0": {"rate": "0.5"}},
+        {"0": {"rate": 2**1100}},
+        {"0": {"rate": 1e300}},
+        {"0": {"rate": float("nan")}},
+        {"0": {"position": {"x": None}}},
+        {"0": {"position": [1.0, 2.0, 3.0]}},
+        {"0": {"name": 5}},
+        {"-0": {"count": 1}},
+        {True: {"count": 1}},
+    ],
+)
+def test_patch_trm_rejects_invalid_values(tmp_path: Path, entry_patches: dict):
+    original_bytes = _build_trm_file(tmp_path).read_bytes()
+
+    with pytest.raises(ValueError):
+        patch_trm(original_bytes, {"entries": entry_patches})
+
+
 def test_legacy_text_trm_still_parses(tmp_path: Path):
     content = "name = Example\nvalue = 42\n"
     trm_path = tmp_path / "text.trm"
@@ -150,3 +310,37 @@ def test_cli_to_json_and_back(tmp_path: Path, capsys: pytest.CaptureFixture[str]
 
     captured = capsys.readouterr()
     assert captured.err == ""
+
+
+def test_cli_legacy_text_roundtrip(tmp_path: Path):
+    trm_path = tmp_path / "text.trm"
+    trm_path.write_text("# comment\nname = Ärger\nvalue = 42\n", encoding="utf-8")
+    out_json = tmp_path / "out.json"
+    out_trm = tmp_path / "restored.trm"
+
+    main(["to-json", str(trm_path), str(out_json)])
+    main(["to-trm", str(out_json), str(out_trm)])
+
+    assert out_trm.read_text(encoding="utf-8") == "name = Ärger\nvalue = 42\n"
+    assert trm_from_mapping({"name": "Ärger", "value": "42"}) == "name = Ärger\nvalue = 42\n"
+
+
+def test_cli_falls_back_to_argparse_for_other_invocations(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    trm_path = _build_trm_file(tmp_path)
+    fast_json = tmp_path / "fast.json"
+    parsed_json = tmp_path / "parsed.json"
+
+    main(["to-json", str(trm_path), str(fast_json)])
+    main(["to-json", "--", str(trm_path), str(parsed_json)])
+    assert parsed_json.read_bytes() == fast_json.read_bytes()
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(["to-json", "--help"])
+    assert excinfo.value.code == 0
+    assert "Path to the source TRM file." in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(["to-xml", "a", "b"])
+    assert excinfo.value.code == 2
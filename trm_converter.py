@@ -14,20 +14,38 @@ Each entry exposes the following decoded fields for human-friendly editing:
   pass_value, rate_u32 (bitwise float), zero_unused
 - position: 3×float32 at offset 0x54
 - raw_entry_base64: base64 of the entire 6692-byte entry for lossless
-  roundtripping when only a few fields are modified.
+  roundtripping when only a few fields are modified. In-process callers can
+  ask for ``raw_entry`` instead, a memoryview into the parsed buffer that is
+  only base64-encoded once the data is written as JSON.
 
-Text-based key/value TRM files remain supported as a fallback if the binary
-layout cannot be parsed.
+Text-based key/value TRM files remain supported; files without NUL bytes in
+their first 64 KiB are treated as text.
 """
 from __future__ import annotations
 
-import argparse
-import base64
-import json
+import codecs
+import functools
+import math
+import mmap
+import os
+import re
 import struct
 import sys
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List
+
+if TYPE_CHECKING:
+    import argparse
+
+try:  # SIMD-accelerated drop-in replacement for the stdlib codec
+    from pybase64 import b64decode, b64encode
+except ImportError:  # pragma: no cover - depends on the environment
+    from base64 import b64decode, b64encode
+
+try:  # much faster JSON encoder, used when its output is equivalent
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 ENTRY_SIZE = 6692
 FOOTER_FLOAT_COUNT = 8
@@ -51,14 +69,62 @@ HEADER_FIELD_NAMES = [
     "rate_u32",
     "zero_unused",
 ]
+RATE_FIELD_INDEX = HEADER_FIELD_NAMES.index("rate_u32")
+
+_U32 = struct.Struct("<I")
+_F32 = struct.Struct("<f")
+_HDR = struct.Struct(f"<{HEADER_FIELD_COUNT}I")
+_POS = struct.Struct(f"<{POSITION_FLOAT_COUNT}f")
+_FOOTER = struct.Struct(f"<{FOOTER_FLOAT_COUNT}f")
+
+# Dict keys for the leading _ENTRY_STRUCT fields, in output order.
+_ROW_KEYS = ("name", *HEADER_FIELD_NAMES)
+
+# Offsets of the individually patchable fields within an entry.
+_HEADER_FIELD_OFFSETS = {
+    field: HEADER_FIELD_OFFSET + index * _U32.size
+    for index, field in enumerate(HEADER_FIELD_NAMES)
+}
+_POSITION_OFFSETS = {
+    axis: POSITION_OFFSET + index * _F32.size for index, axis in enumerate("xyz")
+}
+
+# Shared zero runs for entries without preserved raw bytes and name padding.
+_EMPTY_ENTRY = bytes(ENTRY_SIZE)
+_EMPTY_NAME = bytes(NAME_SIZE)
+
+# orjson writes NaN/Infinity as a bare null; the float32 fields can hold them.
+_ORJSON_NULL_RE = re.compile(rb'(?:": |\n +)null(?:,|\n|$)')
+
+# NUL bytes this early in a file are a reliable sign of binary content.
+BINARY_SNIFF_SIZE = 64 * 1024
+
+# Prefix decoded first to rule out an encoding before decoding everything.
+ENCODING_PROBE_SIZE = 4096
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Whole-entry layout: name, header fields, gap, position, opaque tail.
+_ENTRY_STRUCT = struct.Struct(
+    f"<{NAME_SIZE}s{HEADER_FIELD_COUNT}I"
+    f"{POSITION_OFFSET - HEADER_FIELD_OFFSET - _HDR.size}x"
+    f"{POSITION_FLOAT_COUNT}f"
+    f"{ENTRY_SIZE - POSITION_OFFSET - _POS.size}x"
+)
 
 
 def _decode_bytes_with_fallback(data: bytes, encodings: tuple[str, ...]) -> str:
     """Decode bytes using several encodings in order."""
 
     last_error: UnicodeDecodeError | None = None
+    probe = data[:ENCODING_PROBE_SIZE] if len(data) > ENCODING_PROBE_SIZE else None
     for encoding in encodings:
         try:
+            if probe is not None:
+                # Most mismatches show up early; rule them out on a small
+                # prefix before paying for a full decode.
+                codecs.getincrementaldecoder(encoding)().decode(probe, final=False)
             return data.decode(encoding)
         except UnicodeDecodeError as exc:  # pragma: no cover - exercised via fallback success
             last_error = exc
@@ -67,22 +133,38 @@ def _decode_bytes_with_fallback(data: bytes, encodings: tuple[str, ...]) -> str:
     raise UnicodeDecodeError("unknown", b"", 0, 1, "no encodings provided")
 
 
+def _read_file_bytes(path: Path) -> bytes:
+    """Read a whole file in one go without a BufferedReader in between."""
+
+    with open(path, "rb", buffering=0) as handle:
+        return handle.readall()
+
+
 def read_text_with_fallback(
     path: Path, encodings: tuple[str, ...] = ("utf-8", "cp1252", "latin-1")
 ) -> str:
     """Read text trying several encodings."""
 
-    return _decode_bytes_with_fallback(path.read_bytes(), encodings)
+    return _decode_bytes_with_fallback(_read_file_bytes(path), encodings)
+
+
+_BINARY_TEXT_ERROR = (
+    "TRM file appears to be binary (contains NUL bytes). "
+    "This tool only supports text-based 'key = value' TRM files."
+)
+
+
+def _is_binary_bytes(data: bytes | mmap.mmap) -> bool:
+    """Return True if the start of ``data`` contains a NUL byte."""
+
+    return data.find(b"\x00", 0, BINARY_SNIFF_SIZE) != -1
 
 
 def _raise_if_binary(text: str) -> None:
     """Raise a helpful error if the text looks binary."""
 
     if "\x00" in text:
-        raise ValueError(
-            "TRM file appears to be binary (contains NUL bytes). "
-            "This tool only supports text-based 'key = value' TRM files."
-        )
+        raise ValueError(_BINARY_TEXT_ERROR)
 
 
 def parse_trm_text(text: str) -> Dict[str, str]:
@@ -93,105 +175,137 @@ def parse_trm_text(text: str) -> Dict[str, str]:
     data: Dict[str, str] = {}
     for line_no, raw_line in enumerate(text.splitlines(), start=1):
         line = raw_line.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
-        if "=" not in line:
+        key, sep, value = line.partition("=")
+        if not sep:
             raise ValueError(f"Line {line_no} is missing '=': {raw_line!r}")
-        key, value = line.split("=", 1)
         data[key.strip()] = value.strip()
     return data
 
 
-def _read_cstring(data: bytes, size: int) -> str:
-    trimmed = data[:size]
-    nul = trimmed.find(b"\x00")
-    if nul != -1:
-        trimmed = trimmed[:nul]
-    return trimmed.decode("ascii", errors="ignore")
-
-
-def _u32_to_float(value: int) -> float:
-    return struct.unpack("<f", struct.pack("<I", value))[0]
+def _read_cstrings(fields: List[bytes]) -> List[str]:
+    """Decode a column of NUL-terminated ASCII fields with one decode call."""
 
+    if not fields:
+        return []
+    trimmed = [field.partition(b"\x00")[0] for field in fields]
+    return b"\x00".join(trimmed).decode("ascii", errors="ignore").split("\x00")
 
-def _float_to_u32(value: float) -> int:
-    return struct.unpack("<I", struct.pack("<f", float(value)))[0]
 
+def _u32s_to_floats(values: List[int]) -> tuple[float, ...]:
+    """Reinterpret a batch of u32 values as float32 in one pack/unpack pair."""
 
-def _parse_entry(entry_bytes: bytes) -> dict:
-    if len(entry_bytes) != ENTRY_SIZE:
-        raise ValueError(f"Expected entry size {ENTRY_SIZE}, got {len(entry_bytes)}")
+    count = len(values)
+    return struct.unpack(f"<{count}f", struct.pack(f"<{count}I", *values))
 
-    header_values = struct.unpack_from("<10I", entry_bytes, HEADER_FIELD_OFFSET)
-    header_map = dict(zip(HEADER_FIELD_NAMES, header_values))
-    position = struct.unpack_from("<3f", entry_bytes, POSITION_OFFSET)
 
-    entry: dict = {
-        "name": _read_cstring(entry_bytes, NAME_SIZE),
-        **header_map,
-        "rate": _u32_to_float(header_map["rate_u32"]),
-        "position": {"x": position[0], "y": position[1], "z": position[2]},
-        "raw_entry_base64": base64.b64encode(entry_bytes).decode("ascii"),
-    }
+def _float_to_u32(value: float) -> int:
+    return _U32.unpack(_F32.pack(float(value)))[0]
+
+
+def _build_entry(
+    fields: tuple, name: str, rate: float, entry_bytes: memoryview, encode_raw: bool
+) -> dict:
+    # zip() stops at the header fields: one C-level call reserves the name
+    # slot and stores all ten header values; the rest is filled in after.
+    entry = dict(zip(_ROW_KEYS, fields))
+    entry["name"] = name
+    entry["rate"] = rate
+    x, y, z = fields[1 + HEADER_FIELD_COUNT :]
+    entry["position"] = {"x": x, "y": y, "z": z}
+    if encode_raw:
+        entry["raw_entry_base64"] = b64encode(entry_bytes).decode("ascii")
+    else:
+        entry["raw_entry"] = entry_bytes
     return entry
 
 
-def parse_trm_binary_bytes(data: bytes) -> dict:
+def _read_entry_count(data: bytes | mmap.mmap) -> int:
     if len(data) < HEADER_OFFSET + FOOTER_SIZE:
         raise ValueError("File too small to be a binary TRM")
 
-    entry_count = struct.unpack_from("<I", data, 0)[0]
+    entry_count = _U32.unpack_from(data, 0)[0]
     expected_size = HEADER_OFFSET + entry_count * ENTRY_SIZE + FOOTER_SIZE
     if len(data) < expected_size:
         raise ValueError("Binary TRM length does not match entry count")
+    return entry_count
+
+
+def parse_trm_binary_bytes(data: bytes | mmap.mmap, *, encode_raw: bool = True) -> dict:
+    """Parse a binary TRM buffer into its JSON-friendly representation.
 
-    entries: List[dict] = []
-    for i in range(entry_count):
-        offset = HEADER_OFFSET + i * ENTRY_SIZE
-        entries.append(_parse_entry(data[offset : offset + ENTRY_SIZE]))
+    With ``encode_raw=False`` each entry keeps a ``raw_entry`` memoryview into
+    ``data`` instead of ``raw_entry_base64``, which skips the base64 round-trip
+    when the result is edited and written back within the same process.
+    """
 
+    entry_count = _read_entry_count(data)
+
+    # Decode every entry's fixed fields in a single C-level pass, then
+    # convert all names and rate bit patterns at once instead of per entry.
     footer_offset = HEADER_OFFSET + entry_count * ENTRY_SIZE
-    footer_floats = list(struct.unpack_from("<8f", data, footer_offset))
+    entry_region = memoryview(data)[HEADER_OFFSET:footer_offset]
+    rows = list(_ENTRY_STRUCT.iter_unpack(entry_region))
+    names = _read_cstrings([row[0] for row in rows])
+    rates = _u32s_to_floats([row[1 + RATE_FIELD_INDEX] for row in rows])
+
+    entries: List[dict] = [
+        _build_entry(
+            row, name, rate, entry_region[i * ENTRY_SIZE : (i + 1) * ENTRY_SIZE], encode_raw
+        )
+        for i, (row, name, rate) in enumerate(zip(rows, names, rates))
+    ]
+
+    footer_floats = list(_FOOTER.unpack_from(data, footer_offset))
 
     return {"entry_count": entry_count, "entries": entries, "footer": {"floats": footer_floats}}
 
 
-def _ensure_entry_bytes(base64_data: str | None) -> bytearray:
+def _ensure_entry_bytes(entry: dict) -> bytes | bytearray | memoryview:
+    # raw_entry only exists in memory (see parse_trm_binary_bytes); JSON
+    # input carries the entry bytes as raw_entry_base64.
+    raw_entry = entry.get("raw_entry")
+    if raw_entry is not None:
+        if not isinstance(raw_entry, (bytes, bytearray, memoryview)):
+            raise ValueError("raw_entry must be a bytes-like object")
+        if len(raw_entry) != ENTRY_SIZE:
+            raise ValueError(f"raw_entry must be {ENTRY_SIZE} bytes long")
+        return raw_entry
+
+    base64_data = entry.get("raw_entry_base64")
     if base64_data is None:
-        return bytearray(ENTRY_SIZE)
-    decoded = base64.b64decode(base64_data)
+        return _EMPTY_ENTRY
+    decoded = b64decode(base64_data)
     if len(decoded) != ENTRY_SIZE:
         raise ValueError(f"raw_entry_base64 must decode to {ENTRY_SIZE} bytes")
-    return bytearray(decoded)
-
+    return decoded
 
-def _write_entry(entry: dict) -> bytes:
-    raw_bytes = _ensure_entry_bytes(entry.get("raw_entry_base64"))
-    if len(raw_bytes) != ENTRY_SIZE:
-        raise ValueError(f"Entry must be {ENTRY_SIZE} bytes long")
 
-    name_bytes = entry.get("name", "").encode("ascii", errors="ignore")
+def _write_name_into(buffer: bytearray, offset: int, name: str) -> None:
+    name_bytes = name.encode("ascii", errors="ignore")
     if len(name_bytes) >= NAME_SIZE:
         raise ValueError("Entry name must be shorter than 32 bytes")
 
     # write name (null-terminated, padded)
-    raw_bytes[0:NAME_SIZE] = b"\x00" * NAME_SIZE
-    raw_bytes[0 : len(name_bytes)] = name_bytes
-
-    header_values: list[int] = []
-    for field in HEADER_FIELD_NAMES:
-        if field == "rate_u32":
-            rate = entry.get("rate")
-            if rate is None:
-                rate_u32 = entry.get("rate_u32", 0)
-            else:
-                rate_u32 = _float_to_u32(rate)
-            header_values.append(int(rate_u32))
-            continue
-        value = entry.get(field, 0)
-        header_values.append(int(value))
+    buffer[offset : offset + NAME_SIZE] = _EMPTY_NAME
+    buffer[offset : offset + len(name_bytes)] = name_bytes
+
+
+def _write_entry_into(buffer: bytearray, offset: int, entry: dict) -> None:
+    buffer[offset : offset + ENTRY_SIZE] = _ensure_entry_bytes(entry)
+    _write_name_into(buffer, offset, entry.get("name", ""))
 
-    struct.pack_into("<10I", raw_bytes, HEADER_FIELD_OFFSET, *header_values)
+    # the float "rate" takes precedence; rate_u32 is not even read then
+    rate = entry.get("rate")
+    header_values = [
+        _float_to_u32(rate)
+        if index == RATE_FIELD_INDEX and rate is not None
+        else int(entry.get(field, 0))
+        for index, field in enumerate(HEADER_FIELD_NAMES)
+    ]
+
+    _HDR.pack_into(buffer, offset + HEADER_FIELD_OFFSET, *header_values)
 
     pos = entry.get("position") or {}
     coords = (
@@ -199,11 +313,17 @@ def _write_entry(entry: dict) -> bytes:
         float(pos.get("y", 0.0)),
         float(pos.get("z", 0.0)),
     )
-    struct.pack_into("<3f", raw_bytes, POSITION_OFFSET, *coords)
-    return bytes(raw_bytes)
+    _POS.pack_into(buffer, offset + POSITION_OFFSET, *coords)
+
+
+def trm_binary_from_json(data: dict) -> bytearray:
+    """Build binary TRM bytes from the JSON structure of a binary TRM.
 
+    Entries may carry either ``raw_entry_base64`` or, as returned by
+    ``parse_trm_binary_bytes(..., encode_raw=False)``, an in-memory
+    ``raw_entry``, which is copied without a base64 round trip.
+    """
 
-def _binary_json_to_bytes(data: dict) -> bytes:
     entries = data.get("entries")
     if not isinstance(entries, list):
         raise ValueError("JSON must contain an 'entries' array for binary TRM output")
@@ -223,59 +343,254 @@ def _binary_json_to_bytes(data: dict) -> bytes:
     if len(footer_list) != FOOTER_FLOAT_COUNT:
         raise ValueError("footer.floats must contain 8 float values")
 
-    buffer = bytearray()
-    buffer += struct.pack("<I", entry_count)
+    # Allocate the whole file once and pack every part in place.
+    footer_offset = HEADER_OFFSET + len(entries) * ENTRY_SIZE
+    buffer = bytearray(footer_offset + FOOTER_SIZE)
+    _U32.pack_into(buffer, 0, entry_count)
 
-    for entry in entries:
+    for index, entry in enumerate(entries):
         if not isinstance(entry, dict):
             raise ValueError("Each entry must be an object")
-        buffer += _write_entry(entry)
+        _write_entry_into(buffer, HEADER_OFFSET + index * ENTRY_SIZE, entry)
 
-    buffer += struct.pack("<8f", *footer_list)
-    return bytes(buffer)
+    _FOOTER.pack_into(buffer, footer_offset, *footer_list)
+    # returned as-is: a bytes() copy would double peak memory for large files
+    return buffer
 
 
-def trm_from_mapping(mapping: Dict[str, str]) -> str:
-    lines = [f"{key} = {value}" for key, value in mapping.items()]
-    return "\n".join(lines) + ("\n" if lines else "")
+def _patch_index(key: object) -> int:
+    if isinstance(key, str) and key.isascii() and key.isdigit():
+        return int(key)
+    if isinstance(key, int) and not isinstance(key, bool) and key >= 0:
+        return key
+    raise ValueError(f"Invalid entry index {key!r}")
+
 
+def _patch_u32(field: str, value: object) -> int:
+    # bool is an int subclass, but True/False are never meant as counts
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"Field {field!r} must be an integer")
+    if not 0 <= value <= 0xFFFFFFFF:
+        raise ValueError(f"Field {field!r} must fit in an unsigned 32-bit integer")
+    return value
 
-def trm_file_to_json(trm_path: Path) -> Dict[str, object]:
-    raw_bytes = trm_path.read_bytes()
+
+def _patch_f32(field: str, value: object) -> float:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f"Field {field!r} must be a number")
     try:
+        number = float(value)
+        _F32.pack(number)
+    except OverflowError:
+        raise ValueError(f"Field {field!r} must be a finite float32 value") from None
+    if not math.isfinite(number):
+        raise ValueError(f"Field {field!r} must be a finite float32 value")
+    return number
+
+
+def patch_trm(original: bytes, patch: dict) -> bytearray:
+    """Apply field edits to a binary TRM without decoding the other entries.
+
+    ``patch`` maps entry indices to the fields to change, for example
+    ``{"entries": {"0": {"count": 77, "rate": 0.1, "position": {"z": 9.5}}}}``.
+    Only the bytes of the edited fields are rewritten; everything else is
+    copied verbatim.
+    """
+
+    entry_count = _read_entry_count(original)
+    entry_patches = patch.get("entries", {})
+    if not isinstance(entry_patches, dict):
+        raise ValueError("patch 'entries' must map entry indices to objects")
+
+    buffer = bytearray(original)
+    for key, fields in entry_patches.items():
+        index = _patch_index(key)
+        if index >= entry_count:
+            raise ValueError(f"Entry index {index} is out of range")
+        if not isinstance(fields, dict):
+            raise ValueError("Each entry patch must be an object")
+
+        offset = HEADER_OFFSET + index * ENTRY_SIZE
+        for field, value in fields.items():
+            if field in _HEADER_FIELD_OFFSETS:
+                number = _patch_u32(field, value)
+                _U32.pack_into(buffer, offset + _HEADER_FIELD_OFFSETS[field], number)
+            elif field == "rate":
+                rate = _patch_f32(field, value)
+                _F32.pack_into(buffer, offset + _HEADER_FIELD_OFFSETS["rate_u32"], rate)
+            elif field == "position":
+                if not isinstance(value, dict):
+                    raise ValueError("position must be an object mapping axes to values")
+                for axis, coord in value.items():
+                    if axis not in _POSITION_OFFSETS:
+                        raise ValueError(f"Unknown position axis {axis!r}")
+                    coord = _patch_f32(f"position.{axis}", coord)
+                    _F32.pack_into(buffer, offset + _POSITION_OFFSETS[axis], coord)
+            elif field == "name":
+                if not isinstance(value, str):
+                    raise ValueError("Entry name must be a string")
+                _write_name_into(buffer, offset, value)
+            else:
+                raise ValueError(f"Cannot patch entry field {field!r}")
+    return buffer
+
+
+def _trm_lines(mapping: Dict[str, str]) -> Iterator[str]:
+    """Yield the ``key = value`` lines of a text TRM."""
+
+    return (f"{key} = {value}\n" for key, value in mapping.items())
+
+
+def trm_from_mapping(mapping: Dict[str, str]) -> str:
+    return "".join(_trm_lines(mapping))
+
+
+def _trm_bytes_to_json(raw_bytes: bytes | mmap.mmap) -> Dict[str, object]:
+    # Every binary TRM has NULs up front (entry count, padded names), while
+    # text TRMs never do, so the sniff picks the parser deterministically.
+    if _is_binary_bytes(raw_bytes):
         return parse_trm_binary_bytes(raw_bytes)
-    except ValueError:
-        text = _decode_bytes_with_fallback(raw_bytes, ("utf-8", "cp1252", "latin-1"))
-        return parse_trm_text(text)
+    # A NUL past the sniff window still rules out text; find it with memchr
+    # on the raw bytes instead of decoding the whole file first.
+    if raw_bytes.find(b"\x00", BINARY_SNIFF_SIZE) != -1:
+        raise ValueError(_BINARY_TEXT_ERROR)
+    text = _decode_bytes_with_fallback(bytes(raw_bytes), ("utf-8", "cp1252", "latin-1"))
+    return parse_trm_text(text)
+
+
+def _parse_trm_file(path: str | Path) -> Dict[str, object]:
+    with open(path, "rb", buffering=0) as handle:
+        if os.fstat(handle.fileno()).st_size < MMAP_THRESHOLD:
+            return _trm_bytes_to_json(handle.readall())
+        # Parse large files straight from the page cache; every value kept in
+        # the result is a copy, so the mapping can be closed afterwards.
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _trm_bytes_to_json(mapped)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_trm_file_cached(path: str, mtime_ns: int, size: int) -> Dict[str, object]:
+    """Parse a TRM file; the stat values only serve as cache key."""
 
+    return _parse_trm_file(path)
 
-def json_file_to_trm(json_path: Path) -> Dict[str, str] | bytes:
-    data = json.loads(json_path.read_text(encoding="utf-8"))
-    if not isinstance(data, dict):
-        raise ValueError("JSON root must be an object mapping keys to values")
+
+def _copy_trm_json(data: Dict[str, object]) -> Dict[str, object]:
+    """Copy a cached parse result deep enough for callers to edit it."""
+
+    entries = data.get("entries")
+    footer = data.get("footer")
+    if not isinstance(entries, list) or not isinstance(footer, dict):
+        return dict(data)
+    return {
+        **data,
+        "entries": [{**entry, "position": dict(entry["position"])} for entry in entries],
+        "footer": {"floats": list(footer["floats"])},
+    }
+
+
+def trm_file_to_json(trm_path: Path, *, cached: bool = False) -> Dict[str, object]:
+    """Parse a text or binary TRM file into its JSON representation.
+
+    With ``cached=True`` re-reading a file with the same path, mtime and size
+    reuses the previous parse (callers get their own copy). That check cannot
+    see a same-size rewrite that keeps the old mtime, e.g. after ``cp -p`` or
+    on filesystems with coarse timestamps, and the last 16 results stay in
+    memory, so only opt in for repeated reads of files known not to change.
+    """
+
+    if not cached:
+        return _parse_trm_file(trm_path)
+    stat = trm_path.stat()
+    parsed = _parse_trm_file_cached(str(trm_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    return _copy_trm_json(parsed)
+
+
+def _load_json_bytes(raw: bytes) -> Any:
+    """Parse JSON straight from bytes, preferring orjson when available."""
+
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity written by json.dumps are rejected by orjson.
+            pass
+    import json
+
+    return json.loads(raw)
+
+
+def json_file_to_trm(json_path: Path) -> Dict[str, str] | bytearray:
+    """Convert a JSON file back into TRM data.
+
+    Binary TRMs come back as a ``bytearray`` and legacy text TRMs as a
+    ``key -> value`` mapping of strings. Callers that tell the two apart
+    should test for ``(bytes, bytearray)`` rather than ``bytes`` alone.
+    """
+
+    data = _load_json_bytes(_read_file_bytes(json_path))
+    try:
+        items = data.items()
+    except AttributeError:
+        raise ValueError("JSON root must be an object mapping keys to values") from None
 
     if "__raw_binary_base64" in data:
         try:
-            return base64.b64decode(data["__raw_binary_base64"], validate=True)
+            return bytearray(b64decode(data["__raw_binary_base64"], validate=True))
         except (ValueError, TypeError) as exc:
             raise ValueError("Invalid base64 data for '__raw_binary_base64'") from exc
 
     if "entries" in data:
-        return _binary_json_to_bytes(data)
+        return trm_binary_from_json(data)
+
+    # Legacy text mapping. JSON object keys are always str; values usually
+    # are too, in which case the loaded dict can be returned as-is.
+    if set(map(type, data.values())) <= {str}:
+        return data
+    return {key: str(value) for key, value in items}
+
+
+def _encode_raw_entries(data: Dict[str, object]) -> Dict[str, object]:
+    """Replace in-memory ``raw_entry`` buffers with ``raw_entry_base64``."""
+
+    entries = data.get("entries")
+    if not isinstance(entries, list):
+        return data
 
-    # Legacy text mapping
-    return {str(key): str(value) for key, value in data.items()}
+    encoded: List[object] = []
+    for entry in entries:
+        if isinstance(entry, dict) and "raw_entry" in entry:
+            raw_entry = entry["raw_entry"]
+            entry = {key: value for key, value in entry.items() if key != "raw_entry"}
+            entry["raw_entry_base64"] = b64encode(raw_entry).decode("ascii")
+        encoded.append(entry)
+    return {**data, "entries": encoded}
 
 
 def write_json(data: Dict[str, object], output: Path) -> None:
-    output.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    data = _encode_raw_entries(data)
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        if not _ORJSON_NULL_RE.search(payload):
+            output.write_bytes(payload)
+            return
+    import json
+
+    # Stream the indented document instead of building it as one string.
+    # newline="\n" matches the orjson bytes above on every platform.
+    with output.open("w", encoding="utf-8", newline="\n") as handle:
+        json.dump(data, handle, indent=2, ensure_ascii=False)
+        handle.write("\n")
 
 
 def write_trm(data: Dict[str, str], output: Path) -> None:
-    output.write_text(trm_from_mapping(data), encoding="utf-8")
+    with output.open("w", encoding="utf-8") as handle:
+        handle.writelines(_trm_lines(data))
 
 
 def build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Convert between TRM and JSON files.")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -290,22 +605,37 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=None)
+def _get_parser() -> argparse.ArgumentParser:
+    """Return a shared parser; argparse parsers can be reused across calls."""
+
+    return build_parser()
+
+
+_COMMANDS = ("to-json", "to-trm")
+
+
 def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
+    # A plain "<command> <input> <output>" call skips argparse entirely;
+    # options such as --help and malformed calls go through the full parser.
+    if len(argv) == 3 and argv[0] in _COMMANDS and not any(arg.startswith("-") for arg in argv[1:]):
+        command, source, target = argv[0], Path(argv[1]), Path(argv[2])
+    else:
+        args = _get_parser().parse_args(argv)
+        command, source, target = args.command, args.input, args.output
 
     try:
-        if args.command == "to-json":
-            data = trm_file_to_json(args.input)
-            write_json(data, args.output)
-        elif args.command == "to-trm":
-            data = json_file_to_trm(args.input)
-            if isinstance(data, bytes):
-                args.output.write_bytes(data)
+        if command == "to-json":
+            data = trm_file_to_json(source)
+            write_json(data, target)
+        else:
+            data = json_file_to_trm(source)
+            if isinstance(data, (bytes, bytearray)):
+                target.write_bytes(data)
             else:
-                write_trm(data, args.output)
-        else:  # pragma: no cover - argparse enforces allowed commands
-            parser.error("Unknown command")
+                write_trm(data, target)
     except (UnicodeDecodeError, OSError, ValueError) as exc:
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)